@@ -0,0 +1,22 @@
+# app/compile_workers.py
+# Compile helpers executed inside the warm ProcessPoolExecutor.
+# Kept in their own module so they stay importable (hence picklable) from the
+# pool's worker processes, which cannot resolve functions defined inside the
+# Streamlit script module.
+
+import subprocess
+from typing import List, Tuple
+
+
+def compile_cpp(cpp_path: str, exe_path: str, flags: List[str]) -> Tuple[int, str, str]:
+    p = subprocess.run(["g++", *flags, cpp_path, "-o", exe_path],
+                       capture_output=True)
+    return (p.returncode, p.stdout.decode("utf-8", errors="replace"),
+            p.stderr.decode("utf-8", errors="replace"))
+
+
+def compile_java(src_path: str, out_dir: str, cwd: str) -> Tuple[int, str, str]:
+    p = subprocess.run(["javac", "-d", out_dir, src_path],
+                       capture_output=True, cwd=cwd)
+    return (p.returncode, p.stdout.decode("utf-8", errors="replace"),
+            p.stderr.decode("utf-8", errors="replace"))
@@ -0,0 +1,126 @@
+// app/runner/Runner.java
+// Long-lived "warm JVM" runner: reads RUN commands from stdin, loads the
+// requested class from the given classpath with a fresh URLClassLoader, and
+// invokes its main() by reflection with stdout/stderr captured. Replies are
+// single lines so the Python side can talk to it over plain pipes:
+//
+//   RUN <b64 classpath> <mainClass>          ->  OK <status> <b64 stdout> <b64 err>
+//   COMPILE <b64 outDir> <class> <b64 src>   ->  OK <status> - <b64 diagnostics>
+//                                                 (empty payloads encoded as "-")
+//                                                ERR <b64 message>
+//
+// Path arguments are base64-encoded because the protocol splits on spaces
+// and cache paths may contain them.
+//
+// Keeping one JVM alive saves the ~300-600 ms startup cost per iterative run,
+// and COMPILE turns each javac fork (a JVM cold start of its own) into an
+// in-process javax.tools call.
+
+import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.File;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.io.StringWriter;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.net.URI;
+import java.net.URL;
+import java.net.URLClassLoader;
+import java.nio.charset.StandardCharsets;
+import java.util.Arrays;
+import java.util.Base64;
+import javax.tools.JavaCompiler;
+import javax.tools.JavaFileObject;
+import javax.tools.SimpleJavaFileObject;
+import javax.tools.ToolProvider;
+
+public class Runner {
+    public static void main(String[] args) throws Exception {
+        BufferedReader in = new BufferedReader(
+                new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        PrintStream realOut = System.out;
+        String line;
+        while ((line = in.readLine()) != null) {
+            String[] parts = line.split(" ", 4);
+            String reply;
+            try {
+                if (parts.length == 3 && parts[0].equals("RUN")) {
+                    reply = run(unb64(parts[1]), parts[2]);
+                } else if (parts.length == 4 && parts[0].equals("COMPILE")) {
+                    reply = compile(unb64(parts[1]), parts[2], parts[3]);
+                } else {
+                    reply = "ERR " + b64("unknown command: " + line);
+                }
+            } catch (Throwable t) {
+                reply = "ERR " + b64(String.valueOf(t));
+            }
+            realOut.println(reply);
+            realOut.flush();
+        }
+    }
+
+    static String run(String classpath, String mainClass) throws Exception {
+        ByteArrayOutputStream outBuf = new ByteArrayOutputStream();
+        ByteArrayOutputStream errBuf = new ByteArrayOutputStream();
+        PrintStream realOut = System.out;
+        PrintStream realErr = System.err;
+        int status = 0;
+        URLClassLoader loader = new URLClassLoader(
+                new URL[]{ new File(classpath).toURI().toURL() });
+        System.setOut(new PrintStream(outBuf, true, "UTF-8"));
+        System.setErr(new PrintStream(errBuf, true, "UTF-8"));
+        try {
+            Class<?> cls = Class.forName(mainClass, true, loader);
+            Method m = cls.getMethod("main", String[].class);
+            m.invoke(null, (Object) new String[0]);
+        } catch (InvocationTargetException e) {
+            status = 1;
+            e.getCause().printStackTrace(System.err);
+        } catch (Throwable t) {
+            status = 1;
+            t.printStackTrace(System.err);
+        } finally {
+            System.setOut(realOut);
+            System.setErr(realErr);
+            loader.close();
+        }
+        return "OK " + status + " " + b64(outBuf.toByteArray()) + " " + b64(errBuf.toByteArray());
+    }
+
+    static String compile(String outDir, String className, String sourceB64) {
+        JavaCompiler compiler = ToolProvider.getSystemJavaCompiler();
+        if (compiler == null) {
+            return "ERR " + b64("no system Java compiler available (JRE only?)");
+        }
+        final String source = unb64(sourceB64);
+        JavaFileObject file = new SimpleJavaFileObject(
+                URI.create("string:///" + className + ".java"),
+                JavaFileObject.Kind.SOURCE) {
+            @Override public CharSequence getCharContent(boolean ignoreErrors) {
+                return source;
+            }
+        };
+        StringWriter diagnostics = new StringWriter();
+        Boolean ok = compiler.getTask(diagnostics, null, null,
+                                      Arrays.asList("-d", outDir), null,
+                                      Arrays.asList(file)).call();
+        int status = Boolean.TRUE.equals(ok) ? 0 : 1;
+        return "OK " + status + " - " + b64(diagnostics.toString());
+    }
+
+    static String unb64(String s) {
+        return new String(Base64.getDecoder().decode(s), StandardCharsets.UTF_8);
+    }
+
+    static String b64(String s) {
+        return b64(s.getBytes(StandardCharsets.UTF_8));
+    }
+
+    static String b64(byte[] data) {
+        if (data.length == 0) {
+            return "-";
+        }
+        return Base64.getEncoder().encodeToString(data);
+    }
+}